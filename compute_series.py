@@ -0,0 +1,31 @@
+'''
+	This file is the compute stage of the graphing pipeline: per game folder it
+		parses every csv once, computes the series plotted by adx_grapher,
+		reach_maker and taut_grapher, and saves them to Series.pkl.gz in that
+		folder. render_graphs.py then draws the graphs from those files alone,
+		so titles, colours, limits or scales can be changed and re-rendered
+		without reparsing or recomputing anything.
+
+	Usage: python compute_series.py <results dir> [# threads]
+'''
+
+import sys
+import adx_grapher
+import reach_maker
+import taut_grapher
+from game import map_games
+
+
+SERIES_NAMES = sorted(set(adx_grapher.SERIES_NAMES + reach_maker.SERIES_NAMES + taut_grapher.SERIES_NAMES))
+
+''' parses all of a game's csv files and writes its series artifact'''
+def compute_game(game):
+	game.load_waterfall().load_campaigns().load_taut()
+	game.save_series(SERIES_NAMES)
+
+
+if __name__ == '__main__':
+	csv_dir = sys.argv[1]
+	threads = int(sys.argv[2]) if len(sys.argv) > 2 else 1
+
+	map_games(compute_game, csv_dir, threads)
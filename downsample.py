@@ -0,0 +1,109 @@
+'''
+	This file decimates long (x, y) series before they are handed to matplotlib,
+		so that the cost of rendering a graph depends on the point budget rather
+		than on how many points were recorded (e.g. thousands of tautonnement
+		iterations on a single day).
+
+	Modes:
+		lttb : largest-triangle-three-buckets, keeps the visual shape of the line
+		minmax : keeps the min and max point of each bucket, so spikes are never lost
+		exact : no decimation, every point is plotted
+
+	A budget of 0 means exact. Otherwise it must be at least MIN_BUDGET, so that
+		both lttb and minmax can stay within it; smaller budgets raise ValueError.
+'''
+
+POINT_BUDGET = 500
+MIN_BUDGET = 4
+MODES = ['lttb', 'minmax', 'exact']
+
+
+''' raises ValueError for an unknown mode, or a budget other than 0 below MIN_BUDGET'''
+def check(budget, mode):
+	if mode not in MODES:
+		raise ValueError("unknown decimation mode: " + str(mode))
+	if budget and budget < MIN_BUDGET:
+		raise ValueError("point budget must be 0 (exact) or at least " + str(MIN_BUDGET) + ": " + str(budget))
+
+
+''' input: x values, y values, max # points to keep, decimation mode
+	returns: (x values, y values) with at most budget points, in x order.
+		a budget of 0 or None, or mode 'exact', returns the series unchanged
+'''
+def decimate(xs, ys, budget=POINT_BUDGET, mode='lttb'):
+	xs, ys = list(xs), list(ys)
+	check(budget, mode)
+
+	if mode == 'exact' or not budget or len(xs) <= budget:
+		return xs, ys
+	if mode == 'minmax':
+		return minmax(xs, ys, budget)
+	return lttb(xs, ys, budget)
+
+
+''' largest-triangle-three-buckets: always keeps the first and last point, and from
+	each bucket in between keeps the point forming the largest triangle with the
+	previously kept point and the average of the next bucket
+'''
+def lttb(xs, ys, budget):
+	n = len(xs)
+	if n <= budget:
+		return xs, ys
+
+	out_x, out_y = [xs[0]], [ys[0]]
+	every = (n - 2) / float(budget - 2)
+	a = 0 # index of last kept point
+
+	for i in range(budget - 2):
+		# bucket we are choosing a point from
+		start = int(i * every) + 1
+		end = int((i + 1) * every) + 1
+
+		# average of the next bucket (or the last point)
+		next_start = end
+		next_end = min(int((i + 2) * every) + 1, n)
+		if next_start >= next_end:
+			avg_x, avg_y = xs[-1], ys[-1]
+		else:
+			span = next_end - next_start
+			avg_x = sum(xs[next_start:next_end]) / float(span)
+			avg_y = sum(ys[next_start:next_end]) / float(span)
+
+		ax, ay = xs[a], ys[a]
+		best, best_area = start, -1
+		for j in range(start, end):
+			area = abs((ax - avg_x) * (ys[j] - ay) - (ax - xs[j]) * (avg_y - ay))
+			if area > best_area:
+				best, best_area = j, area
+
+		out_x.append(xs[best])
+		out_y.append(ys[best])
+		a = best
+
+	out_x.append(xs[-1])
+	out_y.append(ys[-1])
+	return out_x, out_y
+
+
+''' min/max per bucket: splits the series into budget/2 buckets and keeps the
+	lowest and highest point of each, in their original order
+'''
+def minmax(xs, ys, budget):
+	n = len(xs)
+	buckets = budget // 2
+	every = n / float(buckets)
+	out_x, out_y = [], []
+
+	for i in range(buckets):
+		start = int(i * every)
+		end = min(int((i + 1) * every), n)
+		if start >= end:
+			continue
+
+		lo = min(range(start, end), key=lambda j: ys[j])
+		hi = max(range(start, end), key=lambda j: ys[j])
+		for j in sorted(set([lo, hi])):
+			out_x.append(xs[j])
+			out_y.append(ys[j])
+
+	return out_x, out_y
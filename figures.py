@@ -0,0 +1,23 @@
+'''
+	Helpers shared by the graphers. Every graph is drawn on its own Figure rather
+		than through pyplot's current figure, so games can be graphed from several
+		threads at once (see game.map_games).
+'''
+
+import os
+import shutil
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+
+''' returns a new figure with a single set of axes'''
+def new_figure():
+	fig = Figure()
+	FigureCanvasAgg(fig)
+	return fig, fig.add_subplot(111)
+
+''' makes a fresh output directory, removing any old graphs in it'''
+def clean_dir(mydir):
+	if os.path.exists(mydir):
+		shutil.rmtree(mydir)
+	os.makedirs(mydir)
@@ -0,0 +1,509 @@
+'''
+	This file holds the data for a single game (one folder of csv files written by
+		BrownAgent) and the functions that turn that data into the series each
+		grapher plots. Nothing here touches matplotlib or module level state, so
+		it can be imported as a library and several games can be analyzed at once
+		in one process, e.g. from threads.
+
+	Usage:
+		game = Game(fp).load_campaigns().load_waterfall()
+		red_blue = game.get_series('q_per_campaign')
+
+	Series can be saved per game with Game.save_series and read back with
+		load_series, so graphs can be restyled without recomputing anything
+		(see compute_series.py and render_graphs.py).
+
+	adx_grapher.py, reach_maker.py and taut_grapher.py are thin wrappers that
+		load a Game per results folder and graph its series.
+'''
+
+import csv
+import os
+import gzip
+import cPickle
+from collections import defaultdict
+from multiprocessing.pool import ThreadPool
+from timeline import CampaignTimeline
+
+
+NUM_DAYS = 60
+SAMPLE_DAYS = [10,20,30,40,50]
+TAUT_COLORS = ['bo-', 'go-','ro-','co-','mo-','yo-','ko-', '#ff6600']
+ARTIFACT = "/Series.pkl.gz"
+
+''' Data class from Waterfall Alg. return'''
+class Entry:
+	def __init__(self, row):
+		self.day = int(row[0])
+
+		sex = (0 if row[1]=='LOW_INCOME' else 1)
+		age = (0 if row[2]=='YOUNG' else 1)
+		income = (0 if row[3]=='MALE' else 1)
+
+		self.mkt = (sex, age, income)
+
+		self.cmp_ID = int(row[4])
+		self.p = float(row[5])
+		self.b = float(row[6])
+		self.q = int(row[7])
+
+		self.id = str(id(self))
+
+''' Data class from Campaign Decisions report '''
+class Campaign:
+	def __init__(self, row):
+		self.cmp_ID = int(row[1])
+		self.start = int(row[7])
+		self.end = int(row[8])
+		self.reach = int(row[9])
+		self.bid = 0
+		self.id = str(id(self))
+		self.budget = 0
+
+''' Data class from bid bundle report'''
+class Bid_Bundle:
+	def __init__(self, row):
+		self.day = int(row[0])
+		self.cmp_ID = int(row[7])
+		self.mkt = (row[1], row[2], row[3])
+		self.bid = int(row[8])
+		self.id = str(id(self))
+
+''' data structure to store return of tautonnement process'''
+class Taut_Entry:
+	def __init__(self, row):
+		self.day = int(row[0])
+		self.iter = int(row[1])
+		self.demand = float(row[2])
+		self.price = float(row[3])
+		#sex, age, inc
+		self.mkt = row[6] + row[5] + row[4]
+
+		self.id = str(id(self))
+
+
+#############################
+''' UNPACK CSV FILES '''
+#############################
+
+'''Input: Waterfall_Alg_Data
+	Returns:  dictionary of day -> Entry
+			  dictionary of mkt -> Entry
+			  dictionary of e.id -> Entry
+'''
+def unpack_waterfall(csv_file):
+	with open(csv_file, 'rb') as csvfile:
+		reader = csv.reader(csvfile, delimiter=',')
+		days = defaultdict(set)
+		mkts = defaultdict(set)
+		entries = {}
+		next(reader)
+
+		for row in reader:
+			e = Entry(row)
+			entries[e.id] = e
+
+			days[e.day].add(e.id)
+			mkts[e.mkt].add(e.id)
+		return days, mkts, entries
+
+'''input: 	Daily_Bid_Bundles.csv
+	returns : 	dictionary of Entries (entry.id-> entry)
+				dictionary of day-> entry.id
+'''
+def unpack_bidbundle(csv_file):
+	with open(csv_file, 'rb') as csvfile:
+		reader = csv.reader(csvfile, delimiter=',')
+		next(reader)
+		entries = {}
+		days = defaultdict(set)
+
+		for row in reader:
+			e = Bid_Bundle(row)
+			entries[e.id] = e
+			days[e.day].add(e.id)
+
+		return entries, days
+
+
+''' input : AdNetwork_Reports.csv
+	returns: list of dictionaries of market segments, day-> mkt seg -> (# won, avg price)
+'''
+def unpack_report(csv_file):
+	with open(csv_file, 'rb') as csvfile:
+		reader = csv.reader(csvfile, delimiter=',')
+		next(reader)
+
+		mkts_won = [{}for x in range(NUM_DAYS)]
+		for row in reader:
+			day = int(row[0])
+			if int(row[4]) != 0:
+				mkts_won[day][(row[1], row[2], row[3])] = int(row[4]), float(row[5])
+
+		return mkts_won
+
+
+''' Input: Campaign_Stat_Reports.csv
+	returns: dictionary of impressions reached (day, cmp id) -> # imps
+			 dictionary of costs day -> cid -> cost
+			 dictionary of cid -> latest # imps reached
+			 set of cIDs of all owned campaigns
+'''
+def unpack_campaign(csv_file):
+	with open(csv_file, 'rb') as csvfile:
+		reader = csv.reader(csvfile, delimiter=',')
+		reached_imps = {x:defaultdict(int) for x in range(NUM_DAYS)} # day, id -> imps
+		reached_cost = {x:defaultdict(int) for x in range(NUM_DAYS)} # day, id -> cost
+		reached_per_cmp = defaultdict(float) # id -> imps
+		owned = set()
+		next(reader)
+		for row in reader:
+
+			reached_imps[int(row[0])][int(row[1])] = float(row[2])
+			reached_cost[int(row[0])][int(row[1])] = float(row[4])
+			reached_per_cmp[int(row[1])] = float(row[2])
+
+			# keep track of cIDs of all owned campaigns
+			owned.add(int(row[1]))
+
+		return reached_imps, reached_cost, reached_per_cmp, owned
+
+
+'''Input: Campaign_Decisions.csv
+   returns: dictionary of Campaign data structures (cmp.ID -> cmp data) for all campaigns
+'''
+def unpack_decisions(csv_file):
+	with open(csv_file, 'rb') as file1:
+		reader = csv.reader(file1, delimiter=',')
+		cmps = {}
+		next(reader)
+		for row in reader:
+			e = Campaign(row)
+			cmps[e.cmp_ID] = e
+
+	return cmps
+
+
+'''Input: UCS_and_Campaign_Auctions.csv, cmp.ID -> cmp data, set of owned cIDs
+   returns: dictionary of day -> (ucs level, ucs cost)
+			dictionary of day -> quality
+	sets budget and bid on the given owned Campaigns
+'''
+def unpack_auctions(csv_file, cmps, owned):
+	with open(csv_file, 'rb') as file2:
+		reader = csv.reader(file2, delimiter=',')
+		next(reader)
+		ucs= {} # day -> (ucs level, ucs cost)
+		quality = {} #day -> quality
+		for row in reader:
+			ucs[int(row[0])] = [float(row[1]), float(row[2])]
+			quality[int(row[0])] = float(row[8])
+
+			# if campaign is owned, set budget and bid
+			if int(row[4]) in owned:
+				cmps[int(row[4])].bid = int(row[5])
+				cmps[int(row[4])].budget = float(row[7])
+
+	return ucs, quality
+
+
+''' input: Taut_Returns.csv
+	returns: dictionary of e.id -> Taut_Entry
+			 dictionary of day -> list of e.id, in iteration order
+'''
+def unpack_taut(csv_file):
+	days = defaultdict(list)
+	entries = {}
+	with open(csv_file, 'rb') as csvfile:
+		for row in csv.reader(csvfile):
+			e = Taut_Entry(row)
+			entries[e.id] = e
+			days[e.day].append(e.id)
+
+	return entries, days
+
+''' input: Supply.csv
+	returns: dictionary of mkt -> supply
+'''
+def unpack_supply(csv_file):
+	with open(csv_file, 'rb') as csvfile:
+		reader = csv.reader(csvfile, delimiter=',')
+		next(reader)
+		supply = {}
+		for row in reader:
+			mkt = row[0] + row[1] + row[2]
+			supply[mkt] = float(row[3])
+
+	return supply
+
+''' maps market segment to a color for graphing'''
+def make_color_array(supply):
+	color_dict = {}
+	i = 0
+	for mkt in supply:
+		color_dict[mkt] = TAUT_COLORS[i]
+		i+=1
+
+	return color_dict
+
+
+##########################
+''' COMPUTE SERIES '''
+##########################
+
+''' Per owned campaign, targetted Q values (from waterfall) and actual Q values
+	(from campaign reports)
+	returns: cid -> (red, blue, b2) where red = [(day, imps received)],
+				blue = [(day, imps targeted)], b2 = received + targeted per blue day
+			 cid -> day -> imps targeted, cid -> day -> imps received
+'''
+def q_per_campaign_series(days, entries, impressions, my_campaigns):
+	series = {}
+
+	# campaign -> day -> q, stored for totals graph
+	totals_targeted, totals_recieved = {}, {}
+
+	for campaign in sorted(my_campaigns):
+		red, blue = [], []
+		totals_recieved[campaign]={}
+		totals_targeted[campaign]={}
+
+		# for each day, sum over qs per campaign in all mkt segs
+		for d in range(NUM_DAYS):
+			waterfall_q = sum([entries[e].q for e in days[d] if entries[e].cmp_ID == campaign])
+
+			if (waterfall_q !=0):
+				blue.append((d+1,waterfall_q))
+				totals_targeted[campaign][d+1] = waterfall_q
+
+			# actual impressions received on day d for campaign dic
+			for dic in impressions[d]:
+				if dic == campaign:
+					red.append((d-1,  impressions[d][dic]))
+					totals_recieved[campaign][d-1] = impressions[d][dic]
+
+		b2 = [red[j-1][1] + blue[i][1] for i in range(len(blue)) for j in range(len(red)) if red[j][0] ==blue[i][0]]
+		series[campaign] = (red, blue, b2)
+
+	return series, totals_targeted, totals_recieved
+
+''' Per owned campaign, targetted P values (from waterfall) and actual amount spent
+	returns: cid -> (red, blue, b2) as in q_per_campaign_series, in cost
+			 cid -> day -> amt spent
+'''
+def p_per_campaign_series(days, entries, costs, impressions, my_campaigns):
+	series = {}
+
+	totals_spent = {} # cmp->money spent
+	for campaign in sorted(my_campaigns):
+		totals_spent[campaign] = {} #cmp->day->amt spent
+		red, blue = [],[]
+		for d in range(NUM_DAYS):
+
+			waterfall_p = sum([entries[e].p*entries[e].q for e in days[d] if entries[e].cmp_ID == campaign])
+			if (waterfall_p !=0):
+				blue.append((d+1,waterfall_p))
+
+			# actual costs for campaign dic on day d
+			for dic in costs[d]:
+				if dic == campaign:
+					red.append((d-1,  costs[d][dic]*impressions[d][dic]))
+					totals_spent[campaign][d-1] = costs[d][dic]
+
+		b2 = [red[j-1][1] + blue[i][1] for i in range(len(blue)) for j in range(len(red)) if red[j][0] ==blue[i][0]]
+		series[campaign] = (red, blue, b2)
+
+	return series, totals_spent
+
+''' takes in maps of cmp id -> {day : imps targeted} and cmp id->{day: imps received}
+	returns: cid -> (days, fraction away from target on that day)
+'''
+def q_totals_series(q_tar, q_rec):
+	series = {}
+	for c in sorted(q_tar):
+		tar_sorted_keys = sorted(q_tar[c].keys())
+		rec_sorted_keys = sorted(q_rec[c].keys())
+
+		# put in catch for if target == received
+
+		# take the difference of imps recieved yesterday and today if not first day of campaign
+		new_rec = {x:(q_rec[c][x]-q_rec[c][x-1] if x-1>=q_rec[c].iterkeys().next() else q_rec[c][x]) for x in rec_sorted_keys}
+
+		series[c] = ([x for x in tar_sorted_keys if x in rec_sorted_keys], [(q_tar[c][x]-new_rec[x])/q_tar[c][x] for x in rec_sorted_keys if x in tar_sorted_keys])
+
+	return series
+
+''' per campaign, x = start day, y = (amt. spent on last day / budget) * 100
+	returns: (x, y) for campaigns with money spent, (x2, y2) marking campaigns with none
+'''
+def p_totals_series(spent, cmps):
+	x, y= [], [] # (x,y) for campaigns with money spent
+	x2, y2 =[],[]	# (x,y) for marking campaigns with no money spent
+	for c in sorted(spent):
+		nc = cmps[c]
+		last_day = max(k for k,v in spent[c].items())
+
+		if spent[c][last_day] == 0:
+			# if we spent no money on campaign, mark with an x
+			x2.append(nc.start)
+			y2.append(10)
+		else:
+			x.append(nc.start)
+			y.append((spent[c][last_day] / nc.budget)*100)
+
+	return x, y, x2, y2
+
+''' returns: list of [start day, cid, reach, imps reached, percent reach filled]
+	per owned campaign
+'''
+def reach_series(reached_per_cmp, cmps, my_campaigns):
+	rows = []
+	for c in sorted(my_campaigns):
+		if c not in cmps:
+			continue
+		nc = cmps[c]
+		pct = int((reached_per_cmp[nc.cmp_ID]/float(nc.reach))*100)
+		rows.append([nc.start, nc.cmp_ID, nc.reach, reached_per_cmp[nc.cmp_ID], pct])
+
+	return rows
+
+''' returns: dictionary of day - 1 -> # cmps running, over all campaigns in the game'''
+def num_running_series(timeline):
+	return {x:timeline.num_active(x+1) for x in range(NUM_DAYS)} # day -> # cmps running
+
+''' per market, value per iteration for a given day of tautonnement
+	field is 'price', 'demand' or 'supply_demand' (demand - supply)
+	returns: mkt -> (iterations, values)
+'''
+def taut_daily_series(entry_dict, day_dict, day, field, supply=None):
+	my_markets = defaultdict(list)
+	for e in day_dict[day]:
+		my_markets[entry_dict[e].mkt].append(entry_dict[e])
+
+	series = {}
+	for mkt in my_markets:
+		if field == 'supply_demand':
+			vals = [e.demand-supply[mkt] for e in my_markets[mkt]]
+		else:
+			vals = [getattr(e, field) for e in my_markets[mkt]]
+		series[mkt] = ([e.iter for e in my_markets[mkt]], vals)
+
+	return series
+
+''' returns: (days, # iterations of tautonnement on that day)'''
+def iter_series(entry_dict, day_dict):
+	grapher = {}
+	for d in day_dict:
+		grapher[d] = entry_dict[day_dict[d][-1]].iter
+
+	return sorted(grapher), [grapher[k] for k in sorted(grapher)]
+
+
+##########################
+''' GAME '''
+##########################
+
+''' All parsed tables and computed series for one game folder. Load only the
+	tables you need; series are computed on first use and cached on the game.
+'''
+class Game:
+	def __init__(self, fp, sample_days=SAMPLE_DAYS):
+		self.fp = fp
+		self.sample_days = list(sample_days)
+		self.series = {}
+
+	''' Campaign_Stat_Reports.csv, Campaign_Decisions.csv, UCS_and_Campaign_Auctions.csv'''
+	def load_campaigns(self):
+		self.reached_imps, self.reached_cost, self.reached_per_cmp, self.my_campaigns = unpack_campaign(self.fp + "/Campaign_Stat_Reports.csv")
+		self.load_timeline()
+		self.ucs, self.quality = unpack_auctions(self.fp + "/UCS_and_Campaign_Auctions.csv", self.campaigns, self.my_campaigns)
+		return self
+
+	''' Campaign_Decisions.csv only, indexed by day for running/overlap queries'''
+	def load_timeline(self):
+		self.campaigns = unpack_decisions(self.fp + "/Campaign_Decisions.csv")
+		self.timeline = CampaignTimeline(self.campaigns)
+		return self
+
+	''' Waterfall_Alg_Data.csv'''
+	def load_waterfall(self):
+		self.wtr_days, self.wtr_mkts, self.wtr_entries = unpack_waterfall(self.fp + "/Waterfall_Alg_Data.csv")
+		return self
+
+	''' Taut_Returns.csv, Supply.csv'''
+	def load_taut(self):
+		self.taut_entries, self.taut_days = unpack_taut(self.fp + "/Taut_Returns.csv")
+		self.supply = unpack_supply(self.fp + "/Supply.csv")
+		self.colors = make_color_array(self.supply)
+		return self
+
+	''' returns the series for graph name (see SERIES), computing it once per game'''
+	def get_series(self, name):
+		if name not in self.series:
+			self.series[name] = SERIES[name](self)
+		return self.series[name]
+
+	''' writes the named series to the game's artifact file, so graphs can be
+		re-rendered later without reparsing any csv (see load_series)'''
+	def save_series(self, names):
+		artifact = {name: self.get_series(name) for name in names}
+		with gzip.open(self.fp + ARTIFACT, 'wb') as f:
+			cPickle.dump(artifact, f, cPickle.HIGHEST_PROTOCOL)
+
+''' input: game folder
+	returns: dictionary of graph name -> series, as written by Game.save_series
+'''
+def load_series(fp):
+	with gzip.open(fp + ARTIFACT, 'rb') as f:
+		return cPickle.load(f)
+
+
+def _taut_days(game, field):
+	return {d: taut_daily_series(game.taut_entries, game.taut_days, d, field, game.supply) for d in game.sample_days}
+
+''' graph name -> function from a loaded Game to its series'''
+SERIES = {
+	'q_per_campaign': lambda g: q_per_campaign_series(g.wtr_days, g.wtr_entries, g.reached_imps, g.my_campaigns),
+	'p_per_campaign': lambda g: p_per_campaign_series(g.wtr_days, g.wtr_entries, g.reached_cost, g.reached_imps, g.my_campaigns),
+	'q_totals': lambda g: q_totals_series(*g.get_series('q_per_campaign')[1:]),
+	'p_totals': lambda g: p_totals_series(g.get_series('p_per_campaign')[1], g.campaigns),
+	'campaign_info': lambda g: {c: (g.campaigns[c].start, g.campaigns[c].end, g.campaigns[c].reach) for c in g.my_campaigns if c in g.campaigns},
+	'num_owned': lambda g: len(g.my_campaigns),
+	'ucs': lambda g: g.ucs,
+	'quality': lambda g: g.quality,
+	'reach': lambda g: reach_series(g.reached_per_cmp, g.campaigns, g.my_campaigns),
+	'num_running': lambda g: num_running_series(g.timeline),
+	'competition': lambda g: g.timeline.pressure(g.my_campaigns),
+	'taut_price': lambda g: _taut_days(g, 'price'),
+	'taut_demand': lambda g: _taut_days(g, 'demand'),
+	'taut_supply_demand': lambda g: _taut_days(g, 'supply_demand'),
+	'taut_iters': lambda g: iter_series(g.taut_entries, g.taut_days),
+	'taut_colors': lambda g: g.colors,
+}
+
+
+''' yields a Game per folder in a results directory'''
+def games(csv_dir, sample_days=SAMPLE_DAYS):
+	for folder in sorted(os.listdir(csv_dir)):
+		fp = os.path.join(csv_dir, folder)
+		if os.path.isdir(fp):
+			yield Game(fp, sample_days)
+
+''' calls fn on every Game in a results directory, using threads > 1 worker threads
+	returns: list of fn's return values, in folder order
+'''
+def map_games(fn, csv_dir, threads=1):
+	all_games = list(games(csv_dir))
+	if threads <= 1:
+		return [fn(g) for g in all_games]
+
+	pool = ThreadPool(threads)
+	try:
+		return pool.map(fn, all_games)
+	finally:
+		pool.close()
+		pool.join()
+
+''' returns: list of (game folder, CampaignTimeline) for every game in a results directory'''
+def timelines(csv_dir, threads=1):
+	return map_games(lambda game: (game.fp, game.load_timeline().timeline), csv_dir, threads)
@@ -0,0 +1,36 @@
+'''
+	This file is the render stage of the graphing pipeline: per game folder it
+		reads the series saved by compute_series.py and writes every graph
+		made by adx_grapher, reach_maker and taut_grapher. No csv is read
+		here, so style-only changes cost only render time.
+
+	Usage: python render_graphs.py <results dir> [point budget] [lttb|minmax|exact] [# threads]
+'''
+
+import sys
+import adx_grapher
+import reach_maker
+import taut_grapher
+import downsample
+from game import load_series, map_games
+
+
+''' writes all graphs for a game folder from its saved series'''
+def render_game(fp, budget=downsample.POINT_BUDGET, mode='lttb'):
+	series = load_series(fp)
+
+	reach_maker.render(series, fp)
+	adx_grapher.render(series, fp, budget, mode)
+	taut_grapher.render(series, fp, budget, mode)
+
+
+if __name__ == '__main__':
+	csv_dir = sys.argv[1]
+
+	# optional: max # points per plotted line (0 = exact), and decimation mode
+	budget = int(sys.argv[2]) if len(sys.argv) > 2 else downsample.POINT_BUDGET
+	mode = sys.argv[3] if len(sys.argv) > 3 else 'lttb'
+	threads = int(sys.argv[4]) if len(sys.argv) > 4 else 1
+	downsample.check(budget, mode)
+
+	map_games(lambda game: render_game(game.fp, budget, mode), csv_dir, threads)
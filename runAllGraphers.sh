@@ -1,7 +1,8 @@
 #!/bin/bash
 
-python reach_maker.py "$1"
-python adx_grapher.py "$1"
-python taut_grapher.py "$1"
+# compute stage: parse every game once and save its series
+python compute_series.py "$1"
+# render stage: draw every graph from the saved series only
+python render_graphs.py "$1"
 # these parameters can be changed to change which graphs 
 python concat_graphs.py "$1" "/Percent_received.png" "/Quality.png" "/Reach_graph.png" "/Budget_spent.png"
\ No newline at end of file
@@ -0,0 +1,55 @@
+'''
+	Checks CampaignTimeline against a brute-force scan over every campaign,
+		including campaigns that run past num_days.
+
+	Usage: python -m unittest test_timeline
+'''
+
+import random
+import unittest
+from timeline import CampaignTimeline
+
+
+''' stand-in for game.Campaign, which only needs start and end here'''
+class Interval:
+	def __init__(self, start, end):
+		self.start = start
+		self.end = end
+
+
+class TestCampaignTimeline(unittest.TestCase):
+	def setUp(self):
+		rng = random.Random(7)
+		self.cmps = {}
+		for cid in range(1000, 1200):
+			start = rng.randint(0, 75)
+			self.cmps[cid] = Interval(start, start + rng.randint(0, 12))
+		self.timeline = CampaignTimeline(self.cmps, num_days=60)
+
+	def brute_active(self, first, last):
+		return sorted(c for c, v in self.cmps.items() if v.start <= last and v.end >= first)
+
+	def test_active_on(self):
+		for d in range(-2, 90):
+			self.assertEqual(self.timeline.active_on(d), self.brute_active(d, d))
+
+	def test_num_active(self):
+		for d in range(0, 61):
+			self.assertEqual(self.timeline.num_active(d), len(self.brute_active(d, d)))
+		self.assertEqual(self.timeline.num_active(61), 0)
+
+	def test_overlapping(self):
+		for cid, c in self.cmps.items():
+			expected = [x for x in self.brute_active(c.start, c.end) if x != cid]
+			self.assertEqual(self.timeline.overlapping(cid), expected)
+
+	def test_past_num_days(self):
+		timeline = CampaignTimeline({1: Interval(61, 70), 2: Interval(64, 68), 3: Interval(60, 67)}, num_days=60)
+		self.assertEqual(timeline.overlapping(1), [2, 3])
+		self.assertEqual(timeline.overlapping(2), [1, 3])
+		self.assertEqual(timeline.overlapping(3), [1, 2])
+		self.assertEqual(timeline.active_on(65), [1, 2, 3])
+
+
+if __name__ == '__main__':
+	unittest.main()
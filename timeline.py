@@ -0,0 +1,71 @@
+'''
+	This file indexes every campaign in a game (not only the ones we own) by the
+		days it runs, from Campaign_Decisions.csv. A campaign is active on day d
+		when start <= d <= end.
+
+	Active campaign counts per day come from a difference array sweep: +1 on each
+		start day, -1 on the day after each end, then a cumulative sum; only these
+		counts are limited to days 0..num_days. "Which campaigns are active on
+		day d" and "which campaigns overlap campaign X" are answered from the
+		intervals themselves, sorted by start day: a binary search skips every
+		campaign starting after the window, and the rest are masked on end day.
+
+	Usage:
+		timeline = Game(fp).load_timeline().timeline
+		timeline.active_on(20), timeline.overlapping(cid)
+
+		game.timelines(csv_dir) indexes every game in a tournament at once
+'''
+
+import numpy as np
+
+
+NUM_DAYS = 60
+
+
+''' interval index over a dictionary of cmp.ID -> Campaign'''
+class CampaignTimeline:
+	def __init__(self, cmps, num_days=NUM_DAYS):
+		self.num_days = num_days
+		self.cmps = cmps
+
+		# intervals sorted by start day
+		order = sorted(cmps, key=lambda c: (cmps[c].start, c))
+		self.ids = np.array(order, dtype=int)
+		self.starts = np.array([cmps[c].start for c in order], dtype=int)
+		self.ends = np.array([cmps[c].end for c in order], dtype=int)
+
+		# difference array over days 0..num_days, one extra slot for end+1
+		diff = np.zeros(num_days + 2, dtype=int)
+		np.add.at(diff, np.clip(self.starts, 0, num_days + 1), 1)
+		np.add.at(diff, np.clip(self.ends + 1, 0, num_days + 1), -1)
+		self.counts = np.cumsum(diff)[:num_days + 1] # day -> # cmps active
+
+	''' returns: # campaigns active on day d, 0 outside days 0..num_days'''
+	def num_active(self, d):
+		if d < 0 or d > self.num_days:
+			return 0
+		return int(self.counts[d])
+
+	''' returns: sorted list of cIDs of campaigns active on day d'''
+	def active_on(self, d):
+		return self.active_between(d, d)
+
+	''' returns: sorted list of cIDs of campaigns active on any day in [first, last]'''
+	def active_between(self, first, last):
+		started = np.searchsorted(self.starts, last, side='right')
+		mask = self.ends[:started] >= first
+		return sorted(self.ids[:started][mask].tolist())
+
+	''' returns: sorted list of cIDs of other campaigns running on any of campaign cid's days'''
+	def overlapping(self, cid):
+		c = self.cmps[cid]
+		return [x for x in self.active_between(c.start, c.end) if x != cid]
+
+	''' returns: list of [start day, cid, # other campaigns overlapping it] per campaign in cids'''
+	def pressure(self, cids):
+		rows = []
+		for c in sorted(cids):
+			if c in self.cmps:
+				rows.append([self.cmps[c].start, c, len(self.overlapping(c))])
+		return rows